@@ -1,34 +1,247 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Request, request, jsonify, render_template
 from flask_cors import CORS
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from pydub import AudioSegment
-from pydub.utils import make_chunks
-from pydub.effects import normalize
-import time
+import base64
+import io
+import hashlib
+import shutil
+import subprocess
+import tempfile
 from pathlib import Path
 import librosa
 import soundfile as sf
 import noisereduce as nr
 import numpy as np
+try:
+    import pyrubberband as pyrb
+except ImportError:  # Falls back to librosa's phase vocoder
+    pyrb = None
+try:
+    import redis
+except ImportError:  # Falls back to in-process task status
+    redis = None
+try:
+    from rq import Queue
+except ImportError:  # Falls back to background threads
+    Queue = None
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from werkzeug.utils import secure_filename
 
-app = Flask(__name__)
-CORS(app)
-
 # Configuration
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'wav', 'mp3', 'flac', 'aac', 'm4a'}
+UPLOAD_COPY_BUFFER = 4 * 1024 * 1024  # 4MB
 
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+class UploadRequest(Request):
+    """
+    Request that spools uploaded files straight to disk in UPLOAD_FOLDER instead of memory
+    """
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.TemporaryFile('wb+', dir=UPLOAD_FOLDER)
+
+app = Flask(__name__)
+app.request_class = UploadRequest
+CORS(app)
+
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max file size
 
+# Parallelism for per-chunk processing and in-flight Sarvam API requests
+MAX_CHUNK_WORKERS = 4
+MAX_CONCURRENT_REQUESTS = 2  # across all jobs in this process
+REQUESTS_PER_SECOND = 2
+REQUEST_TIMEOUT = (10, 120)  # connect, read seconds
+
+# Task status lives in Redis when REDIS_URL is set so every worker process sees it;
+# otherwise it is kept in this process only
+REDIS_URL = os.environ.get('REDIS_URL')
+TASK_STATUS_TTL = 3600  # seconds
+
+redis_client = redis.Redis.from_url(REDIS_URL, decode_responses=True) if redis is not None and REDIS_URL else None
+
+# With Redis and rq available, jobs run in separate `rq worker` processes instead of request threads
+JOB_QUEUE_NAME = 'translations'
+JOB_TIMEOUT = 3600  # seconds
+API_KEY_TTL = 3600  # seconds a queued job has to start before its API key expires
+job_queue = Queue(JOB_QUEUE_NAME, connection=redis.Redis.from_url(REDIS_URL)) if Queue is not None and redis_client is not None else None
+
 # Global variables to store processing status
 processing_status = {}
+status_lock = threading.Lock()
+
+def _task_key(task_id):
+    return f"task:{task_id}"
+
+def _store_task_status(task_id, status):
+    """Write a task's status to Redis and notify subscribers"""
+    payload = json.dumps(status)
+    redis_client.setex(_task_key(task_id), TASK_STATUS_TTL, payload)
+    redis_client.publish(_task_key(task_id), payload)
+
+def set_task_status(task_id, status):
+    """Replace the stored status for a task"""
+    with status_lock:
+        if redis_client is not None:
+            _store_task_status(task_id, status)
+        else:
+            processing_status[task_id] = status
+
+def update_task_status(task_id, **fields):
+    """Merge fields into the stored status for a task"""
+    with status_lock:
+        if redis_client is not None:
+            # A task's updates all come from the process running it, so the lock is enough here
+            status = get_task_status(task_id) or {}
+            status.update(fields)
+            _store_task_status(task_id, status)
+        else:
+            processing_status.setdefault(task_id, {}).update(fields)
+
+def get_task_status(task_id):
+    """Return a copy of the stored status for a task, or None"""
+    if redis_client is not None:
+        payload = redis_client.get(_task_key(task_id))
+        return json.loads(payload) if payload is not None else None
+
+    with status_lock:
+        status = processing_status.get(task_id)
+        return dict(status) if status is not None else None
+
+class RateLimiter:
+    """
+    Token bucket limiting Sarvam AI requests to `rate` per second (bursting up to `burst`)
+    with at most `max_concurrent` in flight; one instance is shared by every job in the process
+    """
+    def __init__(self, rate, burst, max_concurrent):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+
+    def __enter__(self):
+        self.slots.acquire()
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return self
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def __exit__(self, *exc):
+        self.slots.release()
+
+request_limiter = RateLimiter(REQUESTS_PER_SECOND, burst=MAX_CONCURRENT_REQUESTS, max_concurrent=MAX_CONCURRENT_REQUESTS)
+
+class Cache:
+    """
+    On-disk cache for Sarvam AI responses, keyed by SHA-256 of the request inputs
+    Layout: <root>/{stt,translate,tts}/<hexdigest>.json|.wav
+    Set SARVAM_NO_CACHE=1 to bypass
+    """
+    def __init__(self, root=None):
+        self.root = root or os.path.join(Path.home(), '.cache', 'sarvam_pipeline')
+        self.enabled = os.environ.get('SARVAM_NO_CACHE') != '1'
+
+    @staticmethod
+    def key(*parts):
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode('utf-8')
+            digest.update(part)
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _path(self, namespace, key, ext):
+        return os.path.join(self.root, namespace, f"{key}{ext}")
+
+    def _write(self, path, content):
+        # Write to a temp file and rename so parallel workers never see partial entries
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def get_json(self, namespace, key):
+        if not self.enabled:
+            return None
+        path = self._path(namespace, key, '.json')
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring corrupt cache entry {path}: {e}")
+            return None
+
+    def put_json(self, namespace, key, value):
+        if not self.enabled:
+            return
+        try:
+            self._write(self._path(namespace, key, '.json'), json.dumps(value).encode('utf-8'))
+        except Exception as e:
+            print(f"Cache write failed: {e}")
+
+    def get_bytes(self, namespace, key, ext='.wav'):
+        if not self.enabled:
+            return None
+        path = self._path(namespace, key, ext)
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+            return content or None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring corrupt cache entry {path}: {e}")
+            return None
+
+    def discard(self, namespace, key, ext='.wav'):
+        """Remove an entry that turned out to be unusable"""
+        try:
+            os.remove(self._path(namespace, key, ext))
+        except OSError:
+            pass
+
+    def put_bytes(self, namespace, key, content, ext='.wav'):
+        if not self.enabled:
+            return
+        try:
+            self._write(self._path(namespace, key, ext), content)
+        except Exception as e:
+            print(f"Cache write failed: {e}")
+
+@dataclass
+class ChunkBuf:
+    """
+    Decoded mono audio for one chunk, passed between pipeline stages in memory
+    """
+    name: str
+    samples: np.ndarray  # int16 PCM
+    sr: int
+    duration_ms: int
 
 class AudioTranslationPipeline:
     def __init__(self, api_key):
@@ -37,88 +250,160 @@ class AudioTranslationPipeline:
             "API-Subscription-Key": api_key,
             "Content-Type": "application/json"
         }
+        # Pooled keep-alive session shared by all chunk workers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=frozenset(["POST"]),
+                # Hand back the last error response so callers log it and skip the chunk
+                raise_on_status=False
+            )
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Only the API key is shared; Content-Type differs between JSON and multipart calls
+        self.session.headers.update({"API-Subscription-Key": api_key})
 
-    def verify_chunk_size(self, chunk_file, max_size_mb=25):
+        self.cache = Cache()
+
+    def _post(self, url, **kwargs):
         """
-        Verify chunk size before processing (Sarvam AI has file size limits)
+        POST to Sarvam AI through the shared rate limiter
+        Returns None if the request fails outright (timeout, connection error)
         """
-        file_size_mb = os.path.getsize(chunk_file) / (1024 * 1024)
-        print(f"Chunk {chunk_file}: {file_size_mb:.2f} MB")
+        kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+        with request_limiter:
+            try:
+                return self.session.post(url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                print(f"Request to {url} failed: {e}")
+                return None
 
-        if file_size_mb > max_size_mb:
-            print(f"Warning: Chunk exceeds {max_size_mb}MB limit. Compressing...")
-            # Compress audio if too large
-            audio = AudioSegment.from_wav(chunk_file)
-            # Reduce sample rate and bit depth
-            audio = audio.set_frame_rate(16000).set_sample_width(2)
-            compressed_file = chunk_file.replace('.wav', '_compressed.wav')
-            audio.export(compressed_file, format="wav")
+    @staticmethod
+    def encode_chunk_wav(chunk, max_size_mb=25):
+        """
+        Encode a chunk's samples as PCM_16 WAV bytes for upload
+        Warns if the result would exceed Sarvam AI's file size limit; chunks from
+        split_audio are 16 kHz mono (~1 MB per 30s), far below it
+        """
+        samples, sr = chunk.samples, chunk.sr
 
-            new_size_mb = os.path.getsize(compressed_file) / (1024 * 1024)
-            print(f"Compressed to: {new_size_mb:.2f} MB")
-            return compressed_file
+        # PCM_16 mono is 2 bytes per sample plus a 44-byte header
+        size_mb = (len(samples) * 2 + 44) / (1024 * 1024)
+        if size_mb > max_size_mb:
+            print(f"Warning: Chunk {chunk.name} is {size_mb:.2f} MB, over the {max_size_mb}MB limit")
 
-        return chunk_file
+        buffer = io.BytesIO()
+        sf.write(buffer, samples, sr, format='WAV', subtype='PCM_16')
+        return buffer.getvalue()
 
-    def reduce_noise(self, audio_file):
+    @staticmethod
+    def _load_audio(audio_file):
         """
-        Reduce noise in audio file using noisereduce
+        Load audio as mono float32 samples; WAVs are read directly with soundfile
         """
-        print(f"Reducing noise in: {audio_file}")
+        if not audio_file.lower().endswith('.wav'):
+            return librosa.load(audio_file, sr=None)
 
-        # Load audio with librosa
-        y, sr = librosa.load(audio_file, sr=None)
+        y, sr = sf.read(audio_file, dtype='float32')
+        if y.ndim > 1:
+            y = y.mean(axis=1)
+        return y, sr
 
-        # Reduce noise
-        reduced_noise = nr.reduce_noise(y=y, sr=sr, stationary=False, prop_decrease=0.8)
+    @staticmethod
+    def _time_stretch(y, sr, rate):
+        """
+        Time-stretch speech with Rubber Band (C++), falling back to librosa's phase vocoder
+        """
+        if pyrb is not None:
+            try:
+                return pyrb.time_stretch(y.astype(np.float32), sr, rate)
+            except Exception as e:
+                print(f"Rubber Band unavailable ({e}), using librosa time-stretch")
+        return librosa.effects.time_stretch(y, rate=rate)
 
-        # Save the denoised audio
-        denoised_file = audio_file.replace('.wav', '_denoised.wav')
-        sf.write(denoised_file, reduced_noise, sr)
+    @staticmethod
+    def _to_int16(y):
+        """
+        Convert float samples in [-1, 1] to clipped int16 PCM
+        """
+        return np.clip(y * 32768.0, -32768, 32767).astype(np.int16)
 
-        print(f"Denoised audio saved: {denoised_file}")
-        return denoised_file
+    @staticmethod
+    def _peak_normalize_i16(x):
+        """
+        Scale int16 samples so the loudest one reaches full scale
+        """
+        peak = int(np.abs(x.astype(np.int32)).max()) if len(x) else 0
+        if peak == 0:
+            return x
+        # int32 intermediate: 32768 * 32767 still fits, so the multiply cannot overflow
+        return (x.astype(np.int32) * 32767 // peak).astype(np.int16)
 
-    def calculate_optimal_speech_rate(self, text, target_duration_ms):
+    @staticmethod
+    def reduce_noise_array(y, sr, block_seconds=10, overlap_seconds=2):
         """
-        Calculate optimal speech rate to match target duration without trimming
+        Reduce noise in mono int16 samples using noisereduce and return denoised int16 samples
+        Long audio is denoised in overlapping blocks to cap peak memory; only the block
+        being denoised is held as float32
         """
-        # Estimate speaking time based on text characteristics
-        word_count = len(text.split())
-        char_count = len(text)
+        block_len = int(block_seconds * sr)
+        overlap = int(overlap_seconds * sr)
+        hop = block_len - overlap
 
-        # Average speaking rates (words per minute)
-        # Kannada typically spoken at 140-160 WPM
-        base_wpm = 150
+        # Reduce noise block by block
+        pieces = []
+        prev_tail = None
+        for start in range(0, len(y), hop):
+            block = y[start:start + block_len].astype(np.float32) / 32768.0
+            # Chunks are already denoised concurrently by the chunk pool, so keep noisereduce single-process
+            reduced = nr.reduce_noise(y=block, sr=sr, stationary=False, prop_decrease=0.8, n_jobs=1)
 
-        # Calculate target WPM based on duration
-        target_minutes = target_duration_ms / 60000
-        if target_minutes > 0:
-            target_wpm = word_count / target_minutes
+            # Cross-fade the overlap with the previous block's tail
+            if prev_tail is not None:
+                ramp = np.linspace(0.0, 1.0, len(prev_tail), dtype=reduced.dtype)
+                reduced[:len(prev_tail)] = prev_tail * (1.0 - ramp) + reduced[:len(prev_tail)] * ramp
 
-            # Calculate pace adjustment (1.0 = normal, 0.5 = slow, 2.0 = fast)
-            pace_multiplier = target_wpm / base_wpm
+            if start + block_len >= len(y):
+                pieces.append(AudioTranslationPipeline._to_int16(reduced))
+                break
 
-            # Limit pace to reasonable bounds (0.6 to 1.8)
-            pace_multiplier = max(0.6, min(1.8, pace_multiplier))
+            pieces.append(AudioTranslationPipeline._to_int16(reduced[:-overlap]))
+            prev_tail = reduced[-overlap:]
 
-            print(f"Text: {word_count} words, Target: {target_minutes:.2f} min")
-            print(f"Target WPM: {target_wpm:.1f}, Pace multiplier: {pace_multiplier:.2f}")
+        return np.concatenate(pieces) if pieces else y
+
+    @staticmethod
+    def calculate_paces(texts, target_durations_ms):
+        """
+        Calculate the TTS pace for every chunk at once so translated speech fills its original duration
+        Pace is words-per-minute relative to a 150 WPM baseline (Kannada is typically spoken
+        at 140-160 WPM), clamped to 0.6-1.8; chunks without a usable duration get 1.0
+        """
+        base_wpm = 150
 
-            return pace_multiplier
+        word_counts = np.array([len(text.split()) if text else 0 for text in texts], dtype=np.float64)
+        target_minutes = np.asarray(target_durations_ms, dtype=np.float64) / 60000
 
-        return 1.0  # Default pace
+        paces = np.ones(len(word_counts))
+        valid = target_minutes > 0
+        paces[valid] = np.clip(word_counts[valid] / target_minutes[valid] / base_wpm, 0.6, 1.8)
+        return paces
 
-    def match_speech_timing(self, generated_audio_file, target_duration_ms):
+    @staticmethod
+    def match_speech_timing(y, sr, target_duration_ms):
         """
         Adjust speech timing to match original without trimming content
         Only adds silence if significantly shorter, but preserves all speech
         """
         print(f"Matching speech timing to target: {target_duration_ms/1000:.2f}s")
 
-        # Load generated audio
-        generated_audio = AudioSegment.from_wav(generated_audio_file)
-        generated_duration = len(generated_audio)
+        generated_duration = len(y) * 1000 / sr
 
         print(f"Generated duration: {generated_duration/1000:.2f}s")
         print(f"Target duration: {target_duration_ms/1000:.2f}s")
@@ -126,78 +411,86 @@ class AudioTranslationPipeline:
         # If generated audio is significantly shorter, add some silence at the end
         # This helps maintain natural pauses between chunks
         if generated_duration < (target_duration_ms * 0.8):  # If less than 80% of target
-            silence_duration = target_duration_ms - generated_duration
-            silence = AudioSegment.silent(duration=silence_duration)
-            matched_audio = generated_audio + silence
-
-            matched_file = generated_audio_file.replace('.wav', '_timed.wav')
-            matched_audio.export(matched_file, format="wav")
+            silence_samples = int(target_duration_ms * sr / 1000) - len(y)
+            print(f"Added {silence_samples/sr:.2f}s silence for natural timing")
+            return np.concatenate([y, np.zeros(silence_samples, dtype=y.dtype)])
 
-            print(f"Added {silence_duration/1000:.2f}s silence for natural timing")
-            return matched_file
-        else:
-            print("Duration is acceptable, no timing adjustment needed")
-            return generated_audio_file
+        print("Duration is acceptable, no timing adjustment needed")
+        return y
 
-    def split_audio(self, input_file, chunk_length_ms=30000, output_dir="chunks"):
+    def split_audio(self, input_file, chunk_length_ms=30000, target_sr=16000):
         """
         Split audio file into chunks of specified length (default 30 seconds)
+        Returns a ChunkBuf per chunk holding its mono int16 samples at target_sr
+        The file is read block by block, so the whole input is never decoded into memory
         """
         print(f"Loading audio file: {input_file}")
-        audio = AudioSegment.from_wav(input_file)
 
-        # Normalize audio before splitting
-        audio = normalize(audio)
-        print("Audio normalized")
+        chunk_bufs = []
 
-        # Create output directory
-        os.makedirs(output_dir, exist_ok=True)
+        with sf.SoundFile(input_file) as f:
+            in_sr = f.samplerate
+            frames_per_chunk = chunk_length_ms * in_sr // 1000
 
-        # Create chunks
-        chunks = make_chunks(audio, chunk_length_ms)
+            # First pass finds the peak so every chunk gets the same normalization gain
+            peak = 0.0
+            for block in f.blocks(blocksize=frames_per_chunk, dtype='float32', always_2d=True):
+                peak = max(peak, float(np.abs(block.mean(axis=1)).max()))
+            gain = 1.0 / peak if peak > 0 else 1.0
+            print("Audio normalized")
 
-        chunk_files = []
-        chunk_durations = []
+            f.seek(0)
+            for i, block in enumerate(f.blocks(blocksize=frames_per_chunk, dtype='float32', always_2d=True)):
+                # Mono 16 kHz 16-bit is what STT wants and stays well under the size limit
+                mono = block.mean(axis=1) * gain
+                if in_sr != target_sr:
+                    mono = librosa.resample(mono, orig_sr=in_sr, target_sr=target_sr)
+                samples = self._to_int16(mono)
 
-        for i, chunk in enumerate(chunks):
-            chunk_name = f"{output_dir}/chunk_{i:03d}.wav"
-            # Export with consistent quality
-            chunk.export(chunk_name, format="wav", parameters=["-ac", "1", "-ar", "22050"])
-            chunk_files.append(chunk_name)
-            chunk_durations.append(len(chunk))
-            print(f"Created chunk: {chunk_name} (Duration: {len(chunk)/1000:.2f}s)")
+                chunk_name = f"chunk_{i:03d}"
+                duration_ms = len(samples) * 1000 // target_sr
+                chunk_bufs.append(ChunkBuf(chunk_name, samples, target_sr, duration_ms))
+                print(f"Created chunk: {chunk_name} (Duration: {duration_ms/1000:.2f}s)")
 
-        return chunk_files, chunk_durations
+        return chunk_bufs
 
-    def speech_to_text(self, audio_file_path, source_language='en-IN'):
+    def speech_to_text(self, audio_bytes, source_language='en-IN'):
         """
         Convert speech to text using Sarvam AI
+        audio_bytes is an encoded WAV file
         """
-        print(f"Converting speech to text: {audio_file_path}")
+        print(f"Converting speech to text ({len(audio_bytes) / 1024:.0f} KB)")
 
         url = "https://api.sarvam.ai/speech-to-text"
 
-        with open(audio_file_path, 'rb') as audio_file:
-            files = {
-                'file': ('audio.wav', audio_file, 'audio/wav')
-            }
-            headers = {
-                "API-Subscription-Key": self.api_key
-            }
-            data = {
-                'language_code': source_language
-            }
-
-            response = requests.post(url, files=files, headers=headers, data=data)
-
-            if response.status_code == 200:
-                result = response.json()
-                transcript = result.get('transcript', '')
-                print(f"Transcript: {transcript}")
-                return transcript
-            else:
-                print(f"STT Error: {response.status_code} - {response.text}")
-                return None
+        cache_key = self.cache.key(audio_bytes, source_language)
+        cached = self.cache.get_json('stt', cache_key)
+        if cached and 'transcript' in cached:
+            transcript = cached['transcript']
+            print(f"Transcript (cached): {transcript}")
+            return transcript
+
+        files = {
+            'file': ('audio.wav', audio_bytes, 'audio/wav')
+        }
+        data = {
+            'language_code': source_language
+        }
+
+        response = self._post(url, files=files, data=data)
+        if response is None:
+            return None
+
+        if response.status_code == 200:
+            result = response.json()
+            transcript = result.get('transcript', '')
+            print(f"Transcript: {transcript}")
+            if transcript:
+                self.cache.put_json('stt', cache_key, {'transcript': transcript})
+            return transcript
+        else:
+            print(f"STT Error: {response.status_code} - {response.text}")
+            return None
 
     def translate_text(self, text, source_language='en-IN', target_language='kn-IN'):
         """
@@ -217,29 +510,64 @@ class AudioTranslationPipeline:
             "enable_preprocessing": True
         }
 
-        response = requests.post(url, json=payload, headers=self.headers)
+        cache_key = self.cache.key(text, source_language, target_language, payload["mode"], payload["model"])
+        cached = self.cache.get_json('translate', cache_key)
+        if cached and 'translated_text' in cached:
+            translated_text = cached['translated_text']
+            print(f"Translated (cached): {translated_text}")
+            return translated_text
+
+        response = self._post(url, json=payload, headers=self.headers)
+        if response is None:
+            return None
 
         if response.status_code == 200:
             result = response.json()
             translated_text = result.get('translated_text', '')
             print(f"Translated: {translated_text}")
+            if translated_text:
+                self.cache.put_json('translate', cache_key, {'translated_text': translated_text})
             return translated_text
         else:
             print(f"Translation Error: {response.status_code} - {response.text}")
             return None
 
-    def text_to_speech(self, text, output_file, target_language='kn-IN', target_duration_ms=None):
+    def translate_texts_batch(self, texts, source_language='en-IN', target_language='kn-IN'):
+        """
+        Translate a list of transcripts in one pass, preserving order
+        Sarvam's translate endpoint takes a single input string, so each distinct
+        transcript is sent once (cache hits are free) and misses go out concurrently
+        """
+        unique_texts = list(dict.fromkeys(t for t in texts if t))
+        print(f"Translating {len(unique_texts)} unique transcripts...")
+
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            translations = dict(zip(unique_texts, executor.map(
+                lambda text: self.translate_text(text, source_language, target_language),
+                unique_texts
+            )))
+
+        return [translations.get(t) if t else None for t in texts]
+
+    def text_to_speech(self, text, name, target_language='kn-IN', target_duration_ms=None, pace=None):
         """
         Convert text to speech with natural speed matching
+        pace is normally precomputed for all chunks with calculate_paces
+        Returns a ChunkBuf holding the synthesized audio
         """
-        print(f"Converting text to speech: {output_file}")
+        print(f"Converting text to speech: {name}")
 
         url = "https://api.sarvam.ai/text-to-speech"
 
-        # Calculate optimal speech rate to match timing naturally
         speech_pace = 1.0
-        if target_duration_ms:
-            speech_pace = self.calculate_optimal_speech_rate(text, target_duration_ms)
+        if pace is not None:
+            speech_pace = float(pace)
+        elif target_duration_ms:
+            speech_pace = float(self.calculate_paces([text], [target_duration_ms])[0])
+
+        # Pace is bucketed to two decimals so near-identical requests share a cache entry,
+        # and the bucketed value is what gets sent so cached and fresh audio match
+        speech_pace = round(speech_pace, 2)
 
         payload = {
             "inputs": [text],
@@ -255,182 +583,203 @@ class AudioTranslationPipeline:
 
         print(f"Using speech pace: {speech_pace:.2f}x")
 
-        response = requests.post(url, json=payload, headers=self.headers)
+        cache_key = self.cache.key(text, target_language, payload["speaker"], f"{speech_pace:.2f}", payload["model"])
+        audio_bytes = self.cache.get_bytes('tts', cache_key)
+        audio = None
+
+        if audio_bytes:
+            try:
+                audio = sf.read(io.BytesIO(audio_bytes), dtype='int16')
+                print("Using cached TTS audio")
+            except Exception as e:
+                # A corrupt entry is dropped and the audio requested again
+                print(f"Ignoring corrupt cached TTS audio: {e}")
+                self.cache.discard('tts', cache_key)
+
+        if audio is None:
+            response = self._post(url, json=payload, headers=self.headers)
+            if response is None:
+                return None
+
+            if response.status_code != 200:
+                print(f"TTS Error: {response.status_code} - {response.text}")
+                return None
 
-        if response.status_code == 200:
             result = response.json()
             audio_data = result.get('audios', [])
 
-            if audio_data:
-                # The audio data is base64 encoded
-                import base64
-                audio_bytes = base64.b64decode(audio_data[0])
-
-                # Save initial audio
-                temp_file = output_file.replace('.wav', '_temp.wav')
-                with open(temp_file, 'wb') as f:
-                    f.write(audio_bytes)
-
-                # Reduce noise in generated audio
-                denoised_file = self.reduce_noise(temp_file)
-
-                # Use match_speech_timing instead of match_audio_duration
-                if target_duration_ms:
-                    final_file = self.match_speech_timing(denoised_file, target_duration_ms)
-                    # Copy final file to output location
-                    if final_file != denoised_file:
-                        os.rename(final_file, output_file)
-                        if os.path.exists(denoised_file):
-                            os.remove(denoised_file)
-                    else:
-                        os.rename(denoised_file, output_file)
-                else:
-                    os.rename(denoised_file, output_file)
-
-                # Clean up temp files
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-
-                print(f"High-quality speech-matched audio saved: {output_file}")
-                return output_file
-            else:
+            if not audio_data:
                 print("No audio data received")
                 return None
-        else:
-            print(f"TTS Error: {response.status_code} - {response.text}")
-            return None
-
-    def process_chunk(self, chunk_file, chunk_duration_ms, output_dir="translated_chunks", source_language='en-IN', target_language='kn-IN'):
-        """
-        Process a single audio chunk through the complete pipeline with quality improvements
-        """
-        os.makedirs(output_dir, exist_ok=True)
 
-        chunk_name = Path(chunk_file).stem
-        output_file = f"{output_dir}/{chunk_name}_{target_language.split('-')[0]}.wav"
+            # The audio data is base64 encoded
+            audio_bytes = base64.b64decode(audio_data[0])
 
-        # Step 1: Verify chunk size
-        verified_chunk = self.verify_chunk_size(chunk_file)
-
-        # Step 2: Speech to Text
-        transcript = self.speech_to_text(verified_chunk, source_language)
-        if not transcript:
-            return None
+            # Decode the WAV in memory as int16; no intermediate files are written
+            audio = sf.read(io.BytesIO(audio_bytes), dtype='int16')
+            self.cache.put_bytes('tts', cache_key, audio_bytes)
 
-        # Step 3: Translate
-        translated_text = self.translate_text(transcript, source_language, target_language)
-        if not translated_text:
-            return None
+        y, sr = audio
+        if y.ndim > 1:
+            y = y.mean(axis=1).astype(np.int16)
 
-        # Step 4: Text to Speech with duration matching
-        target_audio = self.text_to_speech(translated_text, output_file, target_language, target_duration_ms=chunk_duration_ms)
+        # Reduce noise in generated audio
+        y = self.reduce_noise_array(y, sr)
 
-        # Clean up compressed file if created
-        if verified_chunk != chunk_file:
-            os.remove(verified_chunk)
+        # Use match_speech_timing instead of match_audio_duration
+        if target_duration_ms:
+            y = self.match_speech_timing(y, sr, target_duration_ms)
 
-        # Add small delay to avoid rate limiting
-        time.sleep(1)
+        print(f"High-quality speech-matched audio ready: {name}")
+        return ChunkBuf(name, y, sr, len(y) * 1000 // sr)
 
-        return target_audio
+    def transcribe_chunk(self, chunk, source_language='en-IN'):
+        """
+        Encode a chunk as WAV and transcribe it
+        """
+        return self.speech_to_text(self.encode_chunk_wav(chunk), source_language)
 
-    def merge_audio_chunks(self, chunk_files, output_file="final_output.wav"):
+    def merge_audio_chunks(self, chunks, output_file="final_output.wav"):
         """
-        Merge translated audio chunks into final output with quality enhancement
+        Merge translated audio chunks (ChunkBufs) into final output with quality enhancement
         """
         print("Merging audio chunks...")
 
-        # Filter out None values and non-existent files
-        valid_chunks = [f for f in chunk_files if f and os.path.exists(f)]
+        # Filter out chunks that failed to translate
+        valid_chunks = [c for c in chunks if c is not None]
 
         if not valid_chunks:
             print("No valid audio chunks to merge")
             return None
 
-        combined = AudioSegment.empty()
+        sr = 22050
+        arrays = []
 
-        for chunk_file in valid_chunks:
+        for chunk in valid_chunks:
             try:
-                chunk_audio = AudioSegment.from_wav(chunk_file)
-                # Normalize each chunk before merging
-                chunk_audio = normalize(chunk_audio)
-                combined += chunk_audio
-                print(f"Added chunk: {chunk_file}")
+                chunk_audio = chunk.samples
+                if chunk.sr != sr:
+                    resampled = librosa.resample(chunk_audio.astype(np.float32) / 32768.0, orig_sr=chunk.sr, target_sr=sr)
+                    chunk_audio = self._to_int16(resampled)
+                arrays.append(chunk_audio)
+                print(f"Added chunk: {chunk.name}")
             except Exception as e:
-                print(f"Error processing chunk {chunk_file}: {e}")
+                print(f"Error processing chunk {chunk.name}: {e}")
+
+        if not arrays:
+            print("No valid audio chunks to merge")
+            return None
+
+        # Concatenate once, then peak-normalize the whole track in a single pass
+        combined = self._peak_normalize_i16(np.concatenate(arrays))
 
-        # Apply final normalization and export with high quality
-        combined = normalize(combined)
-        combined.export(output_file, format="wav", parameters=["-ac", "1", "-ar", "22050", "-b:a", "256k"])
+        sf.write(output_file, combined, sr, subtype='PCM_16')
 
         print(f"Final merged audio saved: {output_file}")
         return output_file
 
     def process_complete_pipeline(self, input_audio_file, output_directory, source_language='en-IN', target_language='kn-IN', task_id=None):
         """
-        Complete pipeline: Split -> Translate each chunk -> Merge with quality enhancements
+        Complete pipeline: Split -> Transcribe chunks -> Translate transcripts -> Synthesize chunks -> Merge
         """
         print("Starting complete audio translation pipeline...")
 
         try:
             if task_id:
-                processing_status[task_id] = {"status": "processing", "progress": "Splitting audio..."}
+                set_task_status(task_id, {"status": "processing", "progress": "Splitting audio..."})
 
             # Step 1: Split audio into 30-second chunks with duration tracking
-            chunk_files, chunk_durations = self.split_audio(input_audio_file)
+            chunks = self.split_audio(input_audio_file)
 
             if task_id:
-                processing_status[task_id]["progress"] = "Processing audio chunks..."
+                update_task_status(task_id, progress="Processing audio chunks...")
+
+            total_chunks = len(chunks)
+
+            def run_stage(stage, work, items):
+                """Run work over items on the chunk pool, reporting per-chunk progress"""
+                completed = 0
+                progress_lock = threading.Lock()
+
+                def run_item(args):
+                    nonlocal completed
+                    i, item = args
+                    result = work(i, item)
+                    # Write the status under the lock too, so progress never goes backwards
+                    with progress_lock:
+                        completed += 1
+                        if task_id:
+                            update_task_status(task_id, progress=f"{stage} chunk {completed}/{total_chunks}")
+                    return result
+
+                # executor.map preserves chunk order in the results
+                with ThreadPoolExecutor(max_workers=MAX_CHUNK_WORKERS) as executor:
+                    return list(executor.map(run_item, enumerate(items)))
+
+            # Step 2: Speech to text for every chunk in parallel
+            def transcribe(i, chunk):
+                print(f"Transcribing chunk {i+1}/{total_chunks}: {chunk.name}")
+                return self.transcribe_chunk(chunk, source_language)
+
+            transcripts = run_stage("Transcribing", transcribe, chunks)
+
+            # Step 3: Translate all transcripts together
+            if task_id:
+                update_task_status(task_id, progress="Translating transcripts...")
 
-            # Step 2: Process each chunk with duration matching
-            translated_chunks = []
-            for i, (chunk_file, chunk_duration) in enumerate(zip(chunk_files, chunk_durations)):
-                print(f"\n{'='*60}")
-                print(f"Processing chunk {i+1}/{len(chunk_files)}: {chunk_file}")
-                print(f"Original duration: {chunk_duration/1000:.2f}s")
-                print(f"{'='*60}")
+            translations = self.translate_texts_batch(transcripts, source_language, target_language)
 
-                if task_id:
-                    processing_status[task_id]["progress"] = f"Processing chunk {i+1}/{len(chunk_files)}"
+            # Step 4: Text to speech with duration matching, in parallel
+            paces = self.calculate_paces(translations, [chunk.duration_ms for chunk in chunks])
 
-                translated_chunk = self.process_chunk(chunk_file, chunk_duration, "translated_chunks", source_language, target_language)
-                translated_chunks.append(translated_chunk)
+            def synthesize(i, item):
+                chunk, translated_text, pace = item
+                if not translated_text:
+                    return None
+                print(f"Synthesizing chunk {i+1}/{total_chunks} (original duration: {chunk.duration_ms/1000:.2f}s)")
+                name = f"{chunk.name}_{target_language.split('-')[0]}"
+                return self.text_to_speech(translated_text, name, target_language, target_duration_ms=chunk.duration_ms, pace=pace)
+
+            translated_chunks = run_stage("Synthesizing", synthesize, list(zip(chunks, translations, paces)))
 
             if task_id:
-                processing_status[task_id]["progress"] = "Merging audio chunks..."
+                update_task_status(task_id, progress="Merging audio chunks...")
 
-            # Step 3: Merge translated chunks
+            # Step 5: Merge translated chunks
             final_output_path = os.path.join(output_directory, f"translated_audio_{target_language.split('-')[0]}.wav")
             final_output = self.merge_audio_chunks(translated_chunks, final_output_path)
 
-            # Step 4: Match audio duration with original
+            # Step 6: Match audio duration with original
             if final_output:
                 matched_output_path = os.path.join(output_directory, f"final_translated_audio_{target_language.split('-')[0]}.wav")
                 self.match_audio_duration(input_audio_file, final_output, matched_output_path)
                 
                 if task_id:
-                    processing_status[task_id] = {"status": "completed", "output_file": matched_output_path}
+                    set_task_status(task_id, {"status": "completed", "output_file": matched_output_path})
                 
                 return matched_output_path
             
             if task_id:
-                processing_status[task_id] = {"status": "failed", "error": "Failed to merge audio chunks"}
+                set_task_status(task_id, {"status": "failed", "error": "Failed to merge audio chunks"})
 
         except Exception as e:
             print(f"Pipeline error: {str(e)}")
             if task_id:
-                processing_status[task_id] = {"status": "failed", "error": str(e)}
+                set_task_status(task_id, {"status": "failed", "error": str(e)})
             return None
 
     @staticmethod
     def match_audio_duration(english_audio_path, kannada_audio_path, output_path):
-        # Load English audio
-        eng_audio, eng_sr = librosa.load(english_audio_path, sr=None)
-        eng_duration = librosa.get_duration(y=eng_audio, sr=eng_sr)
+        # Only the English duration is needed; read it from the WAV header instead of decoding the file
+        if english_audio_path.lower().endswith('.wav'):
+            eng_duration = sf.info(english_audio_path).duration
+        else:
+            eng_audio, eng_sr = AudioTranslationPipeline._load_audio(english_audio_path)
+            eng_duration = len(eng_audio) / eng_sr
 
         # Load Kannada audio
-        kan_audio, kan_sr = librosa.load(kannada_audio_path, sr=None)
-        kan_duration = librosa.get_duration(y=kan_audio, sr=kan_sr)
+        kan_audio, kan_sr = AudioTranslationPipeline._load_audio(kannada_audio_path)
+        kan_duration = len(kan_audio) / kan_sr
 
         print(f"English Duration: {eng_duration:.2f}s")
         print(f"Kannada Duration: {kan_duration:.2f}s")
@@ -448,36 +797,23 @@ class AudioTranslationPipeline:
         print(f"Clamped time-stretch ratio: {clamped_ratio:.3f}")
 
         # Apply time-stretch
-        adjusted_kan_audio = librosa.effects.time_stretch(kan_audio, rate=clamped_ratio)
+        adjusted_kan_audio = AudioTranslationPipeline._time_stretch(kan_audio, kan_sr, clamped_ratio)
 
-        # Save to temp WAV
-        temp_path = "temp_adjusted.wav"
-        sf.write(temp_path, adjusted_kan_audio, kan_sr)
+        # Final trim or pad in samples
+        target_samples = int(eng_duration * kan_sr)
+        pad_samples = target_samples - len(adjusted_kan_audio)
 
-        # Reload with pydub to handle silence trimming/padding
-        adjusted_segment = AudioSegment.from_wav(temp_path)
-        adjusted_duration = len(adjusted_segment) / 1000.0  # in seconds
-
-        # Final trim or pad
-        target_ms = int(eng_duration * 1000)
-        adjusted_ms = int(adjusted_duration * 1000)
-
-        if adjusted_ms < target_ms:
-            silence = AudioSegment.silent(duration=(target_ms - adjusted_ms))
-            final_audio = adjusted_segment + silence
-            print(f"Padded with {target_ms - adjusted_ms}ms silence.")
+        if pad_samples > 0:
+            final_audio = np.concatenate([adjusted_kan_audio, np.zeros(pad_samples, dtype=adjusted_kan_audio.dtype)])
+            print(f"Padded with {pad_samples * 1000 // kan_sr}ms silence.")
         else:
-            final_audio = adjusted_segment[:target_ms]
-            print(f"Trimmed excess audio by {adjusted_ms - target_ms}ms.")
+            final_audio = adjusted_kan_audio[:target_samples]
+            print(f"Trimmed excess audio by {-pad_samples * 1000 // kan_sr}ms.")
 
         # Save final output
-        final_audio.export(output_path, format="wav")
+        sf.write(output_path, final_audio, kan_sr, subtype='PCM_16')
         print(f"✅ Audio saved to {output_path} with exact duration: {eng_duration:.2f}s")
 
-        # Cleanup
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -486,6 +822,29 @@ def process_audio_async(input_file, output_dir, api_key, source_lang, target_lan
     pipeline = AudioTranslationPipeline(api_key)
     pipeline.process_complete_pipeline(input_file, output_dir, source_lang, target_lang, task_id)
 
+def _api_key_key(task_id):
+    return f"task:{task_id}:api_key"
+
+def process_queued_audio(input_file, output_dir, source_lang, target_lang, task_id):
+    """
+    Run audio processing in an rq worker
+    The API key is read from a short-lived Redis key and deleted, so it is never stored with the job
+    """
+    key = _api_key_key(task_id)
+    with redis_client.pipeline() as pipe:
+        pipe.get(key)
+        pipe.delete(key)
+        api_key, _ = pipe.execute()
+
+    if not api_key:
+        set_task_status(task_id, {"status": "failed", "error": "Task expired before a worker started it"})
+        raise RuntimeError(f"No API key for task {task_id}")
+
+    pipeline = AudioTranslationPipeline(api_key)
+    if pipeline.process_complete_pipeline(input_file, output_dir, source_lang, target_lang, task_id) is None:
+        # The task status already records the error; raising marks the rq job as failed too
+        raise RuntimeError(f"Translation task {task_id} failed")
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -516,29 +875,48 @@ def convert_audio():
         # Create output directory if it doesn't exist
         os.makedirs(output_directory, exist_ok=True)
         
-        # Save uploaded file
+        # Save uploaded file, copying from the disk-backed upload stream in large blocks
         filename = secure_filename(file.filename)
         input_file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(input_file_path)
+        with open(input_file_path, 'wb') as out:
+            shutil.copyfileobj(file.stream, out, length=UPLOAD_COPY_BUFFER)
         
-        # Convert to WAV if necessary
+        # Convert to WAV if necessary, straight to the mono 16 kHz PCM that STT expects
         if not filename.lower().endswith('.wav'):
-            audio = AudioSegment.from_file(input_file_path)
             wav_filename = filename.rsplit('.', 1)[0] + '.wav'
             wav_file_path = os.path.join(app.config['UPLOAD_FOLDER'], wav_filename)
-            audio.export(wav_file_path, format="wav")
+            try:
+                subprocess.run(
+                    ["ffmpeg", "-y", "-i", input_file_path, "-ac", "1", "-ar", "16000", "-c:a", "pcm_s16le", "-f", "wav", wav_file_path],
+                    check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+                )
+            except subprocess.CalledProcessError as e:
+                print(f"ffmpeg conversion failed: {e.stderr.decode(errors='replace')}")
+                return jsonify({'error': 'Could not decode the uploaded audio file'}), 400
             input_file_path = wav_file_path
         
         # Generate unique task ID
         import uuid
         task_id = str(uuid.uuid4())
         
-        # Start processing in background thread
-        thread = threading.Thread(
-            target=process_audio_async, 
-            args=(input_file_path, output_directory, api_key, source_language, target_language, task_id)
-        )
-        thread.start()
+        set_task_status(task_id, {"status": "queued", "progress": "Waiting for a worker..."})
+
+        if job_queue is not None:
+            # Hand the job to an rq worker. The function is referenced by dotted path because under
+            # `python app.py` it lives in __main__, which rq workers cannot import
+            redis_client.setex(_api_key_key(task_id), API_KEY_TTL, api_key)
+            job_queue.enqueue(
+                'app.process_queued_audio',
+                input_file_path, output_directory, source_language, target_language, task_id,
+                job_id=task_id, job_timeout=JOB_TIMEOUT
+            )
+        else:
+            # Start processing in background thread
+            thread = threading.Thread(
+                target=process_audio_async,
+                args=(input_file_path, output_directory, api_key, source_language, target_language, task_id)
+            )
+            thread.start()
         
         return jsonify({
             'message': 'Processing started',
@@ -550,8 +928,9 @@ def convert_audio():
 
 @app.route('/status/<task_id>', methods=['GET'])
 def get_status(task_id):
-    if task_id in processing_status:
-        return jsonify(processing_status[task_id])
+    status = get_task_status(task_id)
+    if status is not None:
+        return jsonify(status)
     else:
         return jsonify({'error': 'Task not found'}), 404
 
@@ -192,26 +192,35 @@ function updateProgress(status) {
     const progressMap = {
         'processing': 20,
         'Splitting audio...': 30,
-        'Processing audio chunks...': 60,
+        'Processing audio chunks...': 30,
+        'Translating transcripts...': 50,
         'Merging audio chunks...': 90
     };
     
     let progressPercent = 10; // Default starting progress
     
     if (status.progress) {
-        // Check for chunk processing pattern
-        const chunkMatch = status.progress.match(/Processing chunk (\d+)\/(\d+)/);
+        // Check for per-chunk stage patterns
+        const chunkMatch = status.progress.match(/(Transcribing|Synthesizing) chunk (\d+)\/(\d+)/);
         if (chunkMatch) {
-            const current = parseInt(chunkMatch[1]);
-            const total = parseInt(chunkMatch[2]);
-            progressPercent = 30 + ((current / total) * 30); // 30% to 60%
+            const current = parseInt(chunkMatch[2]);
+            const total = parseInt(chunkMatch[3]);
+            if (chunkMatch[1] === 'Transcribing') {
+                progressPercent = 30 + ((current / total) * 20); // 30% to 50%
+            } else {
+                progressPercent = 50 + ((current / total) * 40); // 50% to 90%
+            }
         } else if (progressMap[status.progress]) {
             progressPercent = progressMap[status.progress];
         }
     }
     
     progressFill.style.width = `${progressPercent}%`;
-    progressStatus.textContent = status.status === 'processing' ? 'Processing...' : status.status;
+    if (status.status === 'queued') {
+        progressStatus.textContent = 'Queued...';
+    } else {
+        progressStatus.textContent = status.status === 'processing' ? 'Processing...' : status.status;
+    }
     progressDetails.textContent = status.progress || 'Processing audio translation...';
 }
 